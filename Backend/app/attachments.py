@@ -0,0 +1,167 @@
+"""
+Content-addressed storage for blog attachments.
+
+Uploads are parsed straight off the request stream and written to disk in
+CHUNK_SIZE pieces while being hashed, so a file is never held in memory.
+Each file is stored once under UPLOAD_DIR/<sha[:2]>/<sha>; uploading the same
+bytes again reuses the existing file.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+load_dotenv()
+
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
+MAX_ATTACHMENT_BYTES = int(os.getenv("MAX_ATTACHMENT_MB", "10")) * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Raster images are the only types served inline; everything else (SVG, HTML, ...)
+# is sent as a download so uploaded scripts can't run on the API origin
+INLINE_CONTENT_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
+_MEDIA_TYPE_RE = re.compile(r"^[a-z0-9!#$&^_.+-]+/[a-z0-9!#$&^_.+-]+$")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class StoredUpload:
+    sha256: str
+    size: int
+    filename: str
+    content_type: str
+
+
+def normalize_content_type(value) -> str:
+    """Bare lowercase media type ("image/png"), without parameters like charset."""
+    media_type, _ = parse_options_header(value)
+    media_type = media_type.decode("latin-1").strip().lower()
+    return media_type if _MEDIA_TYPE_RE.match(media_type) else "application/octet-stream"
+
+
+def attachment_path(sha256: str) -> Path:
+    return UPLOAD_DIR / sha256[:2] / sha256
+
+
+class _FilePartWriter:
+    """python-multipart callbacks that stream the `file` form field to a temp file."""
+
+    def __init__(self, field_name: bytes, max_bytes: int):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.headers = {}
+        self.header_field = b""
+        self.header_value = b""
+        self.writing = False
+        self.file = None
+        self.tmp_path: Optional[str] = None
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.filename = None
+        self.content_type = None
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self.headers.get(b"content-disposition"))
+        # Only the first matching file part is kept; other fields are skipped unbuffered
+        if self.file is None and options.get(b"name") == self.field_name and b"filename" in options:
+            self.filename = os.path.basename(options[b"filename"].decode("latin-1"))
+            self.content_type = normalize_content_type(self.headers.get(b"content-type"))
+            tmp_dir = UPLOAD_DIR / "tmp"
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            fd, self.tmp_path = tempfile.mkstemp(dir=tmp_dir)
+            self.file = os.fdopen(fd, "wb", buffering=CHUNK_SIZE)
+            self.writing = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self.writing:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        self.hasher.update(chunk)
+        self.file.write(chunk)
+
+    def on_part_end(self):
+        self.writing = False
+
+    def discard(self):
+        if self.file is not None and not self.file.closed:
+            self.file.close()
+        if self.tmp_path and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+async def receive_upload(request: Request, field_name: str = "file") -> StoredUpload:
+    """Stream a multipart upload to content-addressed storage.
+
+    Raises ValueError for a malformed body or missing file field and
+    UploadTooLarge once the file passes MAX_ATTACHMENT_BYTES.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type"))
+    if content_type.lower() != b"multipart/form-data" or b"boundary" not in options:
+        raise ValueError("Expected a multipart/form-data body")
+
+    writer = _FilePartWriter(field_name.encode(), MAX_ATTACHMENT_BYTES)
+    parser = MultipartParser(options[b"boundary"], writer.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+        if writer.file is None:
+            raise ValueError(f"Missing '{field_name}' file field")
+        writer.file.close()
+
+        sha256 = writer.hasher.hexdigest()
+        final_path = attachment_path(sha256)
+        if final_path.exists():
+            # Same bytes already stored; keep the existing copy
+            os.remove(writer.tmp_path)
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(writer.tmp_path, final_path)
+    except BaseException:
+        writer.discard()
+        raise
+
+    return StoredUpload(
+        sha256=sha256,
+        size=writer.size,
+        filename=writer.filename or sha256,
+        content_type=writer.content_type,
+    )
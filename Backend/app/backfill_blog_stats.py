@@ -0,0 +1,64 @@
+"""
+Script to populate excerpt, word count, reading time and content hash
+on blogs created before these fields were computed at write time.
+The columns themselves come from app/migrate.py, which runs at startup.
+
+Run from the Backend folder:
+    python -m app.backfill_blog_stats [batch_size]
+"""
+import sys
+from sqlalchemy import bindparam, update
+from app.database import SessionLocal
+from app.models import Blog
+from app.blog_utils import compute_derived_fields
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def backfill(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    blogs = Blog.__table__
+    # Core UPDATE so Blog.updated_at's onupdate doesn't fire: filling derived
+    # data is not an edit, so the original timestamp is kept
+    stmt = (
+        update(blogs)
+        .where(blogs.c.id == bindparam("blog_id"))
+        .values(
+            excerpt=bindparam("excerpt"),
+            word_count=bindparam("word_count"),
+            reading_time=bindparam("reading_time"),
+            content_hash=bindparam("content_hash"),
+            updated_at=blogs.c.updated_at,
+        )
+    )
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            # Keyset pagination on id keeps every batch an index range scan
+            batch = (
+                db.query(Blog.id, Blog.content)
+                .filter(Blog.id > last_id, Blog.content_hash.is_(None))
+                .order_by(Blog.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            rows = [
+                {"blog_id": blog_id, **compute_derived_fields(content)}
+                for blog_id, content in batch
+            ]
+            db.connection().execute(stmt, rows)
+            db.commit()
+            updated += len(rows)
+            last_id = batch[-1].id
+            print(f"  ...processed up to blog id {last_id}")
+    finally:
+        db.close()
+    return updated
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE
+    count = backfill(size)
+    print(f"✓ Backfilled {count} blog(s)")
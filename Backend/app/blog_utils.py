@@ -0,0 +1,103 @@
+import hashlib
+import math
+import re
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models import Tag
+
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    # Strip HTML tags and collapse whitespace, then cut on a word boundary
+    text = _WHITESPACE_RE.sub(" ", _TAG_RE.sub(" ", content)).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip(" .,;:") + "..."
+
+
+def compute_derived_fields(content: str, digest: str | None = None) -> dict:
+    """Values stored on Blog at write time so list views never need `content`."""
+    plain = _TAG_RE.sub(" ", content)
+    word_count = len(plain.split())
+    return {
+        "excerpt": make_excerpt(content),
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+        "content_hash": digest or content_hash(content),
+    }
+
+
+def apply_derived_fields(blog) -> bool:
+    """Refresh derived fields on a Blog. Returns False if content is unchanged."""
+    digest = content_hash(blog.content)
+    if blog.content_hash == digest and blog.excerpt is not None:
+        return False
+    for key, value in compute_derived_fields(blog.content, digest).items():
+        setattr(blog, key, value)
+    return True
+
+
+def normalize_tag(name: str) -> str:
+    """Canonical stored form of a tag name; use it for lookups too."""
+    return name.strip().lower()[:50]
+
+
+def normalize_tags(names: list[str]) -> list[str]:
+    seen = []
+    for name in names:
+        name = normalize_tag(name)
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def get_or_create_tags(db: Session, names: list[str]) -> dict:
+    """Map normalized names to Tag rows, creating missing ones race-safely."""
+    tags = {}
+    if names:
+        tags = {tag.name: tag for tag in db.query(Tag).filter(Tag.name.in_(names)).all()}
+    for name in names:
+        if name in tags:
+            continue
+        # A concurrent writer may create the same tag first; the savepoint lets
+        # us drop our insert and pick up theirs instead of failing the request
+        try:
+            with db.begin_nested():
+                tag = Tag(name=name, blog_count=0)
+                db.add(tag)
+        except IntegrityError:
+            tag = db.query(Tag).filter(Tag.name == name).one()
+        tags[name] = tag
+    return tags
+
+
+def set_blog_tags(db: Session, blog, names: list[str]):
+    """Replace a blog's tags, creating new tags and keeping Tag.blog_count in sync."""
+    wanted = normalize_tags(names)
+    tags = get_or_create_tags(db, wanted)
+
+    current = {tag.name for tag in blog.tags}
+    for tag in blog.tags:
+        if tag.name not in wanted:
+            tag.blog_count = Tag.blog_count - 1
+    for name in wanted:
+        if name not in current:
+            # Increment in SQL so concurrent writers don't lose updates
+            tags[name].blog_count = Tag.blog_count + 1
+    blog.tags = [tags[name] for name in wanted]
+
+
+def release_blog_tags(blog):
+    """Decrement cached tag counts before a blog is deleted."""
+    for tag in blog.tags:
+        tag.blog_count = Tag.blog_count - 1
@@ -3,6 +3,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from app import query_log
 
 # 1. .env file ko load karein
 load_dotenv()
@@ -22,6 +23,9 @@ if SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
 # 'pool_pre_ping=True' connection ko stable rakhta hai
 engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
 
+# Slow-query log + N+1 detection hooks (see app/query_log.py)
+query_log.install(engine)
+
 # 5. Session Local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
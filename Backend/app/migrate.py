@@ -0,0 +1,46 @@
+"""
+Schema upgrade for databases created before the current models.
+
+create_all() only creates missing tables; it never alters an existing one.
+upgrade_schema() adds the columns and indexes later added to `blogs`, and is
+safe to run on every startup (main.py calls it right after create_all()).
+
+Run by hand from the Backend folder:
+    python -m app.migrate
+"""
+from sqlalchemy import inspect, text
+from app.database import Base, engine
+from app.models import Blog
+
+# Columns added to blogs after the first release, with their DDL
+BLOG_COLUMNS = {
+    "excerpt": "VARCHAR(255)",
+    "word_count": "INTEGER NOT NULL DEFAULT 0",
+    "reading_time": "INTEGER NOT NULL DEFAULT 1",
+    "content_hash": "VARCHAR(64)",
+    "views": "INTEGER NOT NULL DEFAULT 0",
+}
+
+BLOG_INDEXES = {
+    # Backs ORDER BY views DESC for GET /blogs/popular
+    "ix_blogs_views": "(views)",
+    # Keyset pagination for GET /blogs
+    "ix_blogs_created_at_id": "(created_at, id)",
+}
+
+
+def upgrade_schema():
+    Base.metadata.create_all(bind=engine)
+    existing = {col["name"] for col in inspect(engine).get_columns(Blog.__tablename__)}
+    with engine.begin() as conn:
+        for name, ddl in BLOG_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {Blog.__tablename__} ADD COLUMN {name} {ddl}"))
+                print(f"✓ Added column blogs.{name}")
+        for name, columns in BLOG_INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {Blog.__tablename__} {columns}"))
+
+
+if __name__ == "__main__":
+    upgrade_schema()
+    print("✓ Schema is up to date")
@@ -1,6 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, Table, UniqueConstraint, func
+from sqlalchemy.orm import relationship
 from app.database import Base  # Note the change in import path
 
+# Blog <-> Tag join table; the PK covers blog -> tags, ix_blog_tags_tag_blog covers tag -> blogs
+blog_tags = Table(
+    "blog_tags",
+    Base.metadata,
+    Column("blog_id", Integer, ForeignKey("blogs.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_blog_tags_tag_blog", "tag_id", "blog_id"),
+)
+
 class Admin(Base):
     __tablename__ = "admins"
     id = Column(Integer, primary_key=True, index=True)
@@ -19,5 +29,48 @@ class Blog(Base):
     author = Column(String(100), nullable=False)
     status = Column(String(50), default="draft", nullable=False)
     is_published = Column(Boolean, default=False, nullable=False)
+    # Derived from content at write time (see app/blog_utils.py)
+    excerpt = Column(String(255), nullable=True)
+    word_count = Column(Integer, default=0, nullable=False)
+    reading_time = Column(Integer, default=1, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    # Flushed in batches by app/view_counter.py; indexed for GET /blogs/popular
+    views = Column(Integer, default=0, server_default="0", nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Load with selectinload() on list routes so a page costs one extra query
+    tags = relationship("Tag", secondary=blog_tags, back_populates="blogs")
+    # Files live on disk (app/attachments.py); content references them by id
+    attachments = relationship(
+        "Attachment", back_populates="blog", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Keyset pagination for GET /blogs (ORDER BY created_at DESC, id DESC)
+    __table_args__ = (Index("ix_blogs_created_at_id", "created_at", "id"),)
+
+class Tag(Base):
+    __tablename__ = "tags"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(50), unique=True, index=True, nullable=False)
+    # Cached number of blogs with this tag, kept in sync by set_blog_tags()
+    blog_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+
+    blogs = relationship("Blog", secondary=blog_tags, back_populates="tags")
+
+class Attachment(Base):
+    __tablename__ = "attachments"
+    id = Column(Integer, primary_key=True, index=True)
+    blog_id = Column(Integer, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Content hash doubles as the storage key, so identical files are stored once
+    sha256 = Column(String(64), nullable=False)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    blog = relationship("Blog", back_populates="attachments")
+
+    # One row per file per blog, even when the same file is uploaded concurrently
+    __table_args__ = (UniqueConstraint("blog_id", "sha256", name="uq_attachments_blog_sha256"),)
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Slow-query log and per-request query accounting.
+
+SQLAlchemy event hooks on `app.database.engine` time every statement and emit
+one JSON line per finding on the "app.query_log" logger:
+
+- "slow_query":  statement took longer than SLOW_QUERY_MS
+- "n_plus_one":  one request ran the same statement shape more than
+                 N_PLUS_ONE_THRESHOLD times
+- "request_queries": per-request summary (only when QUERY_LOG_ALL=1)
+
+On PostgreSQL, slow SELECTs can be re-run under EXPLAIN (ANALYZE, BUFFERS)
+by setting SLOW_QUERY_EXPLAIN=1 and the plan is attached to the record.
+
+Query budgets for tests:
+
+- Routes: the request middleware raises QueryBudgetExceeded when a request runs
+  more statements than ROUTE_BUDGETS[route path] (e.g. "/blogs/{blog_id}") or,
+  failing that, QUERY_BUDGET. QUERY_BUDGET is read from the environment at
+  import, so set it before importing `app`/`main`; ROUTE_BUDGETS can be edited
+  at any time.
+- In-process code: `query_budget(n)` wraps code that runs the queries in the
+  current thread/context (helpers, scripts). It does not see requests sent
+  through TestClient, which runs the app in another thread and where the
+  middleware tracks each request separately.
+"""
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "0") == "1"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+QUERY_LOG_ALL = os.getenv("QUERY_LOG_ALL", "0") == "1"
+# Test mode: when > 0, a request running more statements than its budget raises.
+# Read once at import, so tests must set it before importing the app.
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+
+# Per-route overrides of QUERY_BUDGET, keyed by route path e.g. {"/blogs": 2}
+ROUTE_BUDGETS: dict[str, int] = {}
+
+logger = logging.getLogger("app.query_log")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_IN_LIST_RE = re.compile(r"\(\s*(%\(\w+\)s|\?|:\w+)(\s*,\s*(%\(\w+\)s|\?|:\w+))+\s*\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    def __init__(self, label: str):
+        self.label = label
+        self.total = 0
+        self.total_ms = 0.0
+        self.shapes = Counter()
+
+    def record(self, shape: str, elapsed_ms: float):
+        self.total += 1
+        self.total_ms += elapsed_ms
+        self.shapes[shape] += 1
+
+    def repeated(self, threshold: int) -> dict:
+        return {shape: n for shape, n in self.shapes.items() if n > threshold}
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    # Collapse whitespace and expanded IN (...) lists so equal shapes compare equal
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("(...)", shape)
+
+
+def parameter_shape(parameters):
+    """Types of the bound parameters, never their values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"executemany": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _emit(event_name: str, **fields):
+    logger.warning(json.dumps({"event": event_name, **fields}, default=str))
+
+
+def _explain(conn, statement: str, parameters) -> Optional[list]:
+    # ANALYZE executes the statement again, so only ever do it for reads.
+    # A separate raw cursor keeps the caller's pending result set intact and
+    # does not re-enter these event hooks.
+    # SAVEPOINT needs an open transaction (not the case under AUTOCOMMIT).
+    if not statement.lstrip().upper().startswith("SELECT") or not conn.in_transaction():
+        return None
+    # Never let plan capture fail the caller's query, which already succeeded
+    try:
+        cursor = conn.connection.cursor()
+    except Exception as e:
+        return [{"error": str(e)}]
+    try:
+        # Savepoint so a failing EXPLAIN does not abort the caller's transaction
+        cursor.execute("SAVEPOINT query_log_explain")
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+        plan = cursor.fetchone()[0]
+        cursor.execute("RELEASE SAVEPOINT query_log_explain")
+        return plan
+    except Exception as e:
+        try:
+            cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+        except Exception:
+            pass
+        return [{"error": str(e)}]
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    shape = statement_shape(statement)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(shape, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        record = {
+            "duration_ms": round(elapsed_ms, 2),
+            "statement": shape,
+            "parameters": parameter_shape(parameters),
+            "request": stats.label if stats else None,
+        }
+        if SLOW_QUERY_EXPLAIN and conn.dialect.name == "postgresql" and not executemany:
+            record["plan"] = _explain(conn, statement, parameters)
+        _emit("slow_query", **record)
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute is skipped on errors; drop the orphaned start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def install(engine: Engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def start_tracking(label: str):
+    return _current_stats.set(QueryStats(label))
+
+
+def finish_tracking(token) -> QueryStats:
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+
+    repeated = stats.repeated(N_PLUS_ONE_THRESHOLD)
+    for shape, count in repeated.items():
+        _emit("n_plus_one", request=stats.label, statement=shape, count=count)
+    if QUERY_LOG_ALL:
+        _emit(
+            "request_queries",
+            request=stats.label,
+            total=stats.total,
+            total_ms=round(stats.total_ms, 2),
+        )
+    return stats
+
+
+def check_budget(stats: QueryStats, max_queries: Optional[int]):
+    if max_queries is not None and stats.total > max_queries:
+        raise QueryBudgetExceeded(
+            f"{stats.label} ran {stats.total} queries (budget {max_queries}): "
+            + json.dumps(stats.shapes.most_common(5))
+        )
+
+
+def route_budget(path: str) -> Optional[int]:
+    return ROUTE_BUDGETS.get(path, QUERY_BUDGET or None)
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "query_budget"):
+    """Fail (for tests) when the wrapped block runs more than max_queries statements.
+
+    Only counts queries run in this context; use ROUTE_BUDGETS for routes.
+    """
+    token = start_tracking(label)
+    stats = _current_stats.get()
+    try:
+        yield stats
+    finally:
+        finish_tracking(token)
+    check_budget(stats, max_queries)
@@ -1,7 +1,12 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session, load_only, selectinload
 from app.database import get_db
-from app.models import Blog, Admin
+from app.blog_utils import apply_derived_fields, normalize_tag, set_blog_tags, release_blog_tags
+from app.view_counter import view_counter
+from app.models import Blog, Admin, Tag, blog_tags
 from app.auth import (
     authenticate_admin,
     create_access_token,
@@ -10,12 +15,18 @@ from app.auth import (
 )
 from app.schemas import (
     AdminCreate, AdminResponse, AdminUpdate, TokenResponse,
-    BlogCreate, BlogUpdate, BlogResponse, BlogListResponse
+    BlogCreate, BlogUpdate, BlogResponse, BlogListResponse, TagResponse
 )
 
 # Router Setup
 router = APIRouter()
 
+# Columns a list card needs; content stays unloaded
+BLOG_LIST_COLUMNS = (
+    Blog.id, Blog.title, Blog.author, Blog.excerpt,
+    Blog.word_count, Blog.reading_time, Blog.views, Blog.created_at
+)
+
 # ============ Admin Auth ============
 @router.post("/admin/login", response_model=TokenResponse, tags=["Admin Auth"])
 async def admin_login(
@@ -125,14 +136,55 @@ async def create_blog(
         author=blog_data.author,
         status=blog_data.status
     )
+    apply_derived_fields(new_blog)
+    set_blog_tags(db, new_blog, blog_data.tags)
     db.add(new_blog)
     db.commit()
     db.refresh(new_blog)
     return new_blog
 
 @router.get("/blogs", response_model=list[BlogListResponse], tags=["Blogs"])
-async def list_blogs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return db.query(Blog).order_by(Blog.created_at.desc()).offset(skip).limit(limit).all()
+async def list_blogs(
+    skip: int = 0,
+    limit: int = 10,
+    tag: Optional[str] = None,
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    # A half cursor would silently restart at page 1, so reject it
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="before_created_at and before_id must be given together"
+        )
+
+    # List cards only need the precomputed fields; tags for the whole page
+    # come from one extra selectin query
+    query = db.query(Blog).options(load_only(*BLOG_LIST_COLUMNS), selectinload(Blog.tags))
+
+    if tag:
+        # Walks ix_blog_tags_tag_blog for this tag instead of scanning blogs
+        tag_id = select(Tag.id).where(Tag.name == normalize_tag(tag)).scalar_subquery()
+        query = query.join(blog_tags, blog_tags.c.blog_id == Blog.id).filter(blog_tags.c.tag_id == tag_id)
+
+    # Keyset cursor: pass the created_at and id of the last blog on the previous page
+    if before_id is not None:
+        query = query.filter(tuple_(Blog.created_at, Blog.id) < tuple_(before_created_at, before_id))
+
+    return query.order_by(Blog.created_at.desc(), Blog.id.desc()).offset(skip).limit(limit).all()
+
+@router.get("/blogs/popular", response_model=list[BlogListResponse], tags=["Blogs"])
+async def popular_blogs(limit: int = 10, db: Session = Depends(get_db)):
+    # Walks ix_blogs_views from the top instead of sorting the whole table
+    limit = max(1, min(limit, 100))
+    return (
+        db.query(Blog)
+        .options(load_only(*BLOG_LIST_COLUMNS), selectinload(Blog.tags))
+        .order_by(Blog.views.desc())
+        .limit(limit)
+        .all()
+    )
 
 @router.get("/blogs/summary", tags=["Blogs"])
 async def blogs_summary(db: Session = Depends(get_db)):
@@ -146,6 +198,7 @@ async def get_blog(blog_id: int, db: Session = Depends(get_db)):
     blog = db.query(Blog).filter(Blog.id == blog_id).first()
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
+    view_counter.hit(blog_id)
     return blog
 
 @router.put("/blogs/{blog_id}", response_model=BlogResponse, tags=["Blogs"])
@@ -160,8 +213,13 @@ async def update_blog(
         raise HTTPException(status_code=404, detail="Blog not found")
     
     update_data = blog_data.model_dump(exclude_unset=True)
+    tags = update_data.pop("tags", None)
+    if tags is not None:
+        set_blog_tags(db, blog, tags)
     for key, value in update_data.items():
         setattr(blog, key, value)
+    if "content" in update_data:
+        apply_derived_fields(blog)
     
     db.commit()
     db.refresh(blog)
@@ -176,6 +234,13 @@ async def delete_blog(
     blog = db.query(Blog).filter(Blog.id == blog_id).first()
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
+    release_blog_tags(blog)
     db.delete(blog)
     db.commit()
-    return {"detail": "Deleted successfully"}
\ No newline at end of file
+    return {"detail": "Deleted successfully"}
+
+# ============ Tags ============
+@router.get("/tags", response_model=list[TagResponse], tags=["Tags"])
+async def list_tags(db: Session = Depends(get_db)):
+    # blog_count is maintained on write, so no GROUP BY over blog_tags here
+    return db.query(Tag).filter(Tag.blog_count > 0).order_by(Tag.blog_count.desc(), Tag.name).all()
\ No newline at end of file
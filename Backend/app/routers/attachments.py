@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models import Admin, Attachment, Blog
+from app.auth import get_current_admin
+from app.attachments import (
+    INLINE_CONTENT_TYPES, UploadTooLarge, attachment_path, normalize_content_type, receive_upload
+)
+from app.schemas import AttachmentResponse
+
+# Router Setup
+router = APIRouter(tags=["Attachments"])
+
+# The body is read as a raw stream, so describe the form for Swagger by hand
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.post(
+    "/blogs/{blog_id}/attachments",
+    response_model=AttachmentResponse,
+    status_code=201,
+    openapi_extra=UPLOAD_OPENAPI
+)
+async def upload_attachment(
+    blog_id: int,
+    request: Request,
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    if not db.query(Blog.id).filter(Blog.id == blog_id).first():
+        raise HTTPException(status_code=404, detail="Blog not found")
+    # Return the pooled connection while the upload streams; the session reopens on next use
+    db.close()
+
+    try:
+        upload = await receive_upload(request)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Attachment too large")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    attachment = Attachment(
+        blog_id=blog_id,
+        sha256=upload.sha256,
+        filename=upload.filename[:255],
+        content_type=upload.content_type[:100],
+        size=upload.size
+    )
+    db.add(attachment)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same file already attached to this blog (possibly by a concurrent upload)
+        db.rollback()
+        existing = db.query(Attachment).filter(
+            Attachment.blog_id == blog_id, Attachment.sha256 == upload.sha256
+        ).first()
+        if not existing:
+            # The blog was deleted while the upload streamed
+            raise HTTPException(status_code=404, detail="Blog not found")
+        return existing
+    db.refresh(attachment)
+    return attachment
+
+@router.get("/blogs/{blog_id}/attachments", response_model=list[AttachmentResponse])
+async def list_attachments(blog_id: int, db: Session = Depends(get_db)):
+    return db.query(Attachment).filter(Attachment.blog_id == blog_id).order_by(Attachment.id).all()
+
+@router.get("/attachments/{attachment_id}")
+async def get_attachment(attachment_id: int, request: Request, db: Session = Depends(get_db)):
+    attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    path = attachment_path(attachment.sha256)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Attachment file missing")
+
+    # Stored files never change, so the content hash is a strong ETag
+    headers = {
+        "etag": f'"{attachment.sha256}"',
+        "cache-control": "public, max-age=31536000, immutable",
+        "x-content-type-options": "nosniff",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, headers["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Only raster images render inline; anything else (SVG, HTML, ...) downloads
+    content_type = normalize_content_type(attachment.content_type)
+    inline = content_type in INLINE_CONTENT_TYPES
+    # FileResponse handles Range / If-Range and uses the server's sendfile path when available
+    return FileResponse(
+        path,
+        media_type=content_type,
+        filename=attachment.filename,
+        headers=headers,
+        content_disposition_type="inline" if inline else "attachment"
+    )
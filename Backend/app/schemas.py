@@ -39,18 +39,42 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str
 
+# ============ Tag Schemas ============
+class TagResponse(BaseModel):
+    id: int
+    name: str
+    blog_count: int
+
+    class Config:
+        from_attributes = True
+
+# ============ Attachment Schemas ============
+class AttachmentResponse(BaseModel):
+    id: int
+    blog_id: int
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 # ============ Blog Schemas ============
 class BlogCreate(BaseModel):
     title: str 
     content: str 
     author: str 
     status: Optional[str] = "draft"
+    tags: list[str] = []
 
 class BlogUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
     author: Optional[str] = None
     status: Optional[str] = None
+    tags: Optional[list[str]] = None
 
 class BlogResponse(BaseModel):
     id: int
@@ -58,6 +82,12 @@ class BlogResponse(BaseModel):
     content: str
     author: str
     status: str
+    excerpt: Optional[str] = None
+    word_count: int = 0
+    reading_time: int = 1
+    views: int = 0
+    tags: list[TagResponse] = []
+    attachments: list[AttachmentResponse] = []
     created_at: datetime
     updated_at: datetime
 
@@ -68,6 +98,11 @@ class BlogListResponse(BaseModel):
     id: int
     title: str
     author: str
+    excerpt: Optional[str] = None
+    word_count: int = 0
+    reading_time: int = 1
+    views: int = 0
+    tags: list[TagResponse] = []
     created_at: datetime
 
     class Config:
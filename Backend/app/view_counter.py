@@ -0,0 +1,95 @@
+"""
+Per-worker blog view counter.
+
+`GET /blogs/{id}` only bumps an in-memory counter; a background task flushes
+the accumulated increments to `blogs.views` every VIEW_FLUSH_SECONDS, and once
+more at shutdown, as one UPDATE statement per FLUSH_BATCH_SIZE posts
+(UPDATE ... FROM (VALUES ...) on PostgreSQL). This keeps the read path free of
+row locks at the cost of losing at most one interval of views on a crash.
+"""
+import asyncio
+import os
+import threading
+from collections import Counter
+from dotenv import load_dotenv
+from sqlalchemy import Integer, case, column, update, values
+from app.database import SessionLocal
+from app.models import Blog
+
+load_dotenv()
+
+VIEW_FLUSH_SECONDS = float(os.getenv("VIEW_FLUSH_SECONDS", "10"))
+# Rows per UPDATE statement; keeps the VALUES list bounded for very busy workers
+FLUSH_BATCH_SIZE = 1000
+
+
+def _increment_views(rows: list[tuple[int, int]], dialect: str):
+    """One UPDATE statement (one round trip) applying a batch of (blog_id, n) increments.
+
+    updated_at is pinned to itself so Blog's onupdate doesn't mark viewed posts as edited.
+    """
+    blogs = Blog.__table__
+    if dialect == "postgresql":
+        # UPDATE blogs SET views = blogs.views + v.n FROM (VALUES ...) AS v (blog_id, n) WHERE blogs.id = v.blog_id
+        increments = values(column("blog_id", Integer), column("n", Integer), name="v").data(rows)
+        return (
+            update(blogs)
+            .where(blogs.c.id == increments.c.blog_id)
+            .values(views=blogs.c.views + increments.c.n, updated_at=blogs.c.updated_at)
+        )
+    # Other dialects (e.g. SQLite) lack VALUES column aliases; use a CASE instead
+    return (
+        update(blogs)
+        .where(blogs.c.id.in_([blog_id for blog_id, _ in rows]))
+        .values(
+            views=blogs.c.views + case(dict(rows), value=blogs.c.id, else_=0),
+            updated_at=blogs.c.updated_at,
+        )
+    )
+
+
+class ViewCounter:
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+    def hit(self, blog_id: int):
+        with self._lock:
+            self._pending[blog_id] += 1
+
+    def flush(self) -> int:
+        """Write pending increments to the database. Returns rows touched."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, Counter()
+
+        # Sorted ids keep the lock order stable between flushes; if two workers
+        # still deadlock, the loser's counts are put back and retried next flush
+        rows = sorted(batch.items())
+        db = SessionLocal()
+        try:
+            conn = db.connection()
+            for i in range(0, len(rows), FLUSH_BATCH_SIZE):
+                conn.execute(_increment_views(rows[i:i + FLUSH_BATCH_SIZE], conn.dialect.name))
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                self._pending.update(batch)
+            raise
+        finally:
+            db.close()
+        return len(rows)
+
+    async def run(self, interval: float = VIEW_FLUSH_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"Warning: Could not flush blog views: {e}")
+
+
+view_counter = ViewCounter()
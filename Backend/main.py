@@ -1,23 +1,41 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import Base, engine
-from app.routers import admin, contact
+from app.migrate import upgrade_schema
+from app.routers import admin, attachments, contact
+from app import query_log
+from app.view_counter import view_counter
 import uvicorn
 
 # 1. Create Database Tables (Auto-run)
+# upgrade_schema() runs create_all() and then adds columns/indexes that
+# create_all() won't add to existing tables
 try:
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
 except Exception as e:
     print(f"Warning: Could not create tables: {e}")
 
-# 2. App Initialization
+# 2. Background tasks: flush buffered blog views on an interval and at shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flusher = asyncio.create_task(view_counter.run())
+    yield
+    flusher.cancel()
+    try:
+        await asyncio.to_thread(view_counter.flush)
+    except Exception as e:
+        print(f"Warning: Could not flush blog views: {e}")
+
+# 3. App Initialization
 app = FastAPI(
     title="Emerging Software Backend",
     description="Unified API for Contact Form and Admin Dashboard",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
-# 3. CORS Settings (Global)
+# 4. CORS Settings (Global)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -26,10 +44,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 4. Include Routers
+# Per-request query accounting: N+1 warnings, and budget checks in test mode
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    token = query_log.start_tracking(f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        stats = query_log.finish_tracking(token)
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    query_log.check_budget(stats, query_log.route_budget(path))
+    return response
+
+# 5. Include Routers
 # Admin ke routes ab /api/admin se shuru nahi honge, direct honge jaisa aapne code mein likha tha
 # lekin Contact ke liye maine prefix nahi lagaya kyunke wo already '/contact' hai.
 app.include_router(admin.router) 
+app.include_router(attachments.router)
 app.include_router(contact.router)
 
 @app.get("/", tags=["Health"])
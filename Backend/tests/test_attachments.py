@@ -0,0 +1,17 @@
+from app.attachments import INLINE_CONTENT_TYPES, normalize_content_type
+
+
+def test_content_type_parameters_are_dropped():
+    assert normalize_content_type("image/svg+xml; charset=utf-8") == "image/svg+xml"
+    assert normalize_content_type(b" Image/PNG ") == "image/png"
+
+
+def test_missing_or_malformed_content_type_falls_back():
+    assert normalize_content_type(None) == "application/octet-stream"
+    assert normalize_content_type("not a type") == "application/octet-stream"
+
+
+def test_only_raster_images_render_inline():
+    assert normalize_content_type("image/svg+xml; charset=utf-8") not in INLINE_CONTENT_TYPES
+    assert normalize_content_type("text/html") not in INLINE_CONTENT_TYPES
+    assert normalize_content_type("image/jpeg; q=1") in INLINE_CONTENT_TYPES
@@ -0,0 +1,37 @@
+import os
+import tempfile
+from datetime import datetime
+
+# app.database reads DATABASE_URL at import; point it at a throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+
+from sqlalchemy.dialects import postgresql
+from app.database import Base, SessionLocal, engine
+from app.models import Blog
+from app.view_counter import ViewCounter, _increment_views
+
+OLD = datetime(2020, 1, 1)
+
+
+def test_flush_adds_views_and_keeps_updated_at():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    blog = Blog(title="t", content="c", author="a", created_at=OLD, updated_at=OLD)
+    db.add(blog)
+    db.commit()
+
+    counter = ViewCounter()
+    counter.hit(blog.id)
+    counter.hit(blog.id)
+    assert counter.flush() == 1
+
+    db.refresh(blog)
+    assert blog.views == 2
+    assert blog.updated_at == OLD
+    db.close()
+
+
+def test_postgres_flush_does_not_touch_updated_at():
+    sql = str(_increment_views([(1, 2)], "postgresql").compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES" in sql
+    assert "now()" not in sql